@@ -23,7 +23,7 @@ def test_eastmoney_api():
     # 创建临时去重管理器
     temp_dir = Path("./data/test")
     temp_dir.mkdir(parents=True, exist_ok=True)
-    dedup = DedupManager(temp_dir / "test_hashes.json")
+    dedup = DedupManager(temp_dir / "test_hashes.log")
 
     # 初始化监控器（查询最近30天）
     monitor = AShareMonitor(dedup, days_back=30)